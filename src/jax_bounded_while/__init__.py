@@ -1,18 +1,505 @@
 """Copyright (c) 2026 Nathaniel Starkman. All rights reserved."""
 
-__all__ = ("bounded_while_loop",)
+__all__ = ("bounded_while_loop", "fused_bounded_while_loop")
 
+import functools
+import math
+import types
 from collections.abc import Callable
-from typing import Any, TypeVar
+from typing import Any, Literal, TypeVar
 
 import equinox as eqx
 import jax
 import jax.numpy as jnp
+import numpy as np
 from jax import lax
+from jax.experimental import checkify
 
 # A (very) general PyTree type: any nested structure of JAX arrays/pytrees.
 T = TypeVar("T")
 _BoolScalar = jax.Array  # convention: shape () boolean array
+_Flag = jax.Array | np.generic  # convention: shape () array of `_FLAG_DTYPE`
+_Carry = TypeVar("_Carry")
+# Scan carry: the flat leaves of the user carry, and the `still_running` flag.
+_LeavesCarry = tuple[list[Any], _Flag]
+# One loop step, mapping the carry to the next carry.
+_Step = Callable[[_LeavesCarry], _LeavesCarry]
+# How an overflow of `max_steps` is reported.
+_CheckMode = Literal["runtime", "functional", "off"]
+
+# dtype of the `still_running` flag in the loop carry. XLA's `pred` type can
+# inhibit fusion with the (float) payload of the carry, so the flag is carried
+# as an 8-bit integer and only compared against 0 where a predicate is needed.
+# `jnp.bool_` is a drop-in fallback.
+_FLAG_DTYPE = jnp.int8
+
+# Host-side (NumPy) constant, so that it is folded at trace time rather than
+# re-created as a device array on every trace.
+_RUNNING = np.dtype(_FLAG_DTYPE).type(1)
+
+
+def _as_bool(continue_: object) -> _BoolScalar:
+    """Convert the user condition `continue_` to a boolean array."""
+    continue_ = jnp.asarray(continue_)
+    if continue_.dtype != jnp.bool_:
+        continue_ = continue_.astype(jnp.bool_)
+    return continue_
+
+
+def _advance(flag: _Flag, continue_: object) -> tuple[_BoolScalar, jax.Array]:
+    """Update the `still_running` flag with the user condition `continue_`.
+
+    Returns the new state both as a boolean predicate, for gating the step, and
+    as a flag of dtype `_FLAG_DTYPE`, for the loop carry.
+    """
+    # `lax.bitwise_and` rather than `jnp.logical_and`: the latter re-converts
+    # (possibly weakly typed) predicates, emitting an extra `!= False` per step.
+    still_running = lax.bitwise_and(flag != 0, _as_bool(continue_))
+    return still_running, still_running.astype(_FLAG_DTYPE)
+
+
+def _scan(
+    step: Callable[[_Carry], _Carry],
+    init_carry: _Carry,
+    length: int,
+    *,
+    unroll: int | bool = 1,
+) -> _Carry:
+    """Apply `step` to `init_carry` `length` times in a `lax.scan`.
+
+    The loop only needs its final carry, so there is no scanned-over input and
+    no stacked output. (`lax.fori_loop` with static bounds lowers to this same
+    scan, plus an extra int32 counter in the carry that `step` never uses.)
+    """
+    carry, _ = lax.scan(
+        lambda carry, _: (step(carry), None),
+        init_carry,
+        xs=None,
+        length=length,
+        unroll=unroll,
+    )
+    return carry
+
+
+def _blocked_scan(
+    step: Callable[[_Carry], _Carry],
+    init_carry: _Carry,
+    length: int,
+    *,
+    block_size: int,
+    unroll: int | bool = 1,
+    outer_unroll: int | bool = 1,
+    remat: bool = False,
+) -> _Carry:
+    """Run `length` steps as an outer scan over blocks of `block_size` steps.
+
+    `length` is decomposed as `outer * block_size + remainder`. Each block is
+    an inner scan of `step` (unrolled by `unroll`), the `outer` blocks are
+    scanned over (unrolled by `outer_unroll`), and any remainder is run as a
+    trailing scan. If `remat`, the blocks are rematerialized, so that only the
+    `outer` block-boundary carries are stored for reverse-mode AD.
+    """
+    outer, remainder = divmod(length, block_size)
+
+    def block_step(carry: _Carry) -> _Carry:
+        return _scan(step, carry, block_size, unroll=unroll)
+
+    if remat:
+        step = jax.checkpoint(step, prevent_cse=False)
+        block_step = jax.checkpoint(block_step, prevent_cse=False)
+
+    carry = _scan(block_step, init_carry, outer, unroll=outer_unroll)
+    if remainder:
+        carry = _scan(step, carry, remainder, unroll=unroll)
+    return carry
+
+
+def _early_exit_while_loop(
+    step: _Step,
+    init_carry: _LeavesCarry,
+    *,
+    max_steps: int,
+) -> _LeavesCarry:
+    """Run at most `max_steps` of `step` in a `lax.while_loop`.
+
+    The loop exits as soon as a step finds the user condition `False`, rather
+    than running all `max_steps` steps.
+    """
+
+    def while_cond(carry: tuple[jax.Array, _LeavesCarry]) -> jax.Array:
+        i, (_, flag) = carry
+        return jnp.logical_and(i < max_steps, flag != 0)
+
+    def while_body(
+        carry: tuple[jax.Array, _LeavesCarry],
+    ) -> tuple[jax.Array, _LeavesCarry]:
+        i, inner = carry
+        return i + 1, step(inner)
+
+    _, final_carry = lax.while_loop(while_cond, while_body, (np.int32(0), init_carry))
+    return final_carry
+
+
+def _while_loop(
+    cond_fn: Callable[[T], Any],
+    body_fn: Callable[[T], T],
+    init_val: T,
+    *,
+    max_steps: int,
+) -> tuple[T, jax.Array]:
+    """Run `body_fn` while `cond_fn` holds, for at most `max_steps` steps.
+
+    A plain `lax.while_loop`, so `body_fn` only runs on the iterations actually
+    taken. Also returns whether all `max_steps` steps were taken, i.e. whether
+    the loop overflowed.
+    """
+
+    def while_cond(carry: tuple[jax.Array, T]) -> jax.Array:
+        i, val = carry
+        return lax.bitwise_and(i < max_steps, _as_bool(cond_fn(val)))
+
+    def while_body(carry: tuple[jax.Array, T]) -> tuple[jax.Array, T]:
+        i, val = carry
+        return i + 1, body_fn(val)
+
+    final_i, final_val = lax.while_loop(while_cond, while_body, (np.int32(0), init_val))
+    # Every allowed step was taken, so the loop would still be continuing.
+    return final_val, final_i >= max_steps
+
+
+def _is_static_false(cond_fn: Callable[[T], Any], init_val: T) -> bool:
+    """Whether `cond_fn(init_val)` is a trace-time constant `False`.
+
+    This is the case e.g. when `cond_fn` returns a Python or NumPy constant.
+    `cond_fn` is traced into a separate jaxpr, which is then discarded: it is
+    neither staged into the program nor run, so effectful ops (e.g.
+    `jax.debug.callback`) only happen in the loop itself.
+    """
+    (out,) = jax.make_jaxpr(cond_fn)(init_val).jaxpr.outvars
+    return isinstance(out, jax.extend.core.Literal) and not bool(out.val)
+
+
+def _flatten_like(
+    val: object, treedef: jax.tree_util.PyTreeDef, name: str
+) -> list[Any]:
+    """Flatten `val`, checking that it has the PyTree structure `treedef`."""
+    leaves, val_treedef = jax.tree_util.tree_flatten(val)
+    if val_treedef != treedef:
+        msg = (
+            f"{name} must return a carry with the same PyTree structure as "
+            f"init_val: expected {treedef}, got {val_treedef}."
+        )
+        raise TypeError(msg)
+    return leaves
+
+
+def _select(
+    still_running: _BoolScalar, new_leaves: list[Any], leaves: list[Any]
+) -> list[Any]:
+    """Keep `new_leaves` where the loop is running, and `leaves` otherwise.
+
+    `lax.select` takes the scalar gate as is (lowering to a `select` with a
+    scalar `i1` predicate), giving a single straight-line select per leaf and
+    no broadcast ops. Do not pre-broadcast the gate to the leaf shapes: that
+    would add one `broadcast_in_dim` per distinct leaf shape.
+    """
+    return [
+        lax.select(still_running, new, old)
+        for new, old in zip(new_leaves, leaves, strict=True)
+    ]
+
+
+def _make_step(
+    cond_fn: Callable[[T], Any],
+    body_fn: Callable[[T], T],
+    treedef: jax.tree_util.PyTreeDef,
+    *,
+    vectorized: bool,
+) -> _Step:
+    """Build the loop step acting on the flat leaves of a `treedef` carry."""
+
+    def apply_body(leaves: list[Any]) -> list[Any]:
+        return _flatten_like(
+            body_fn(jax.tree_util.tree_unflatten(treedef, leaves)), treedef, "body_fn"
+        )
+
+    def step(carry: _LeavesCarry) -> _LeavesCarry:
+        """One bounded step.
+
+        carry
+            (leaves, flag) where:
+            - leaves: the flattened user loop carry
+            - flag: whether the loop has not yet terminated (`still_running`)
+        """
+        leaves, flag = carry
+
+        # We are still "in the loop" iff we had not terminated and the user
+        # condition holds.
+        val = jax.tree_util.tree_unflatten(treedef, leaves)
+        still_running, flag = _advance(flag, cond_fn(val))
+
+        new_leaves: list[Any]
+        if vectorized:
+            # Branchless: always apply the body, then keep the old carry
+            # wherever the loop has (logically) terminated.
+            new_leaves = _select(still_running, apply_body(leaves), leaves)
+        else:
+            # Skip the body at runtime once the loop has terminated.
+            new_leaves = lax.cond(still_running, apply_body, lambda ls: ls, leaves)
+        return new_leaves, flag
+
+    return step
+
+
+def _make_fused_step(
+    step_fn: Callable[[T], tuple[T, Any]],
+    treedef: jax.tree_util.PyTreeDef,
+) -> _Step:
+    """Build the (always branchless) loop step of a fused `step_fn`."""
+
+    def step(carry: _LeavesCarry) -> _LeavesCarry:
+        leaves, flag = carry
+
+        # One call gives both the candidate next carry and the condition on
+        # the current one.
+        new_val, continue_ = step_fn(jax.tree_util.tree_unflatten(treedef, leaves))
+        still_running, flag = _advance(flag, continue_)
+        new_leaves = _select(
+            still_running, _flatten_like(new_val, treedef, "step_fn"), leaves
+        )
+        return new_leaves, flag
+
+    return step
+
+
+def _check_overflow(
+    final_val: T, overflowed: jax.Array, *, check_mode: _CheckMode
+) -> T:
+    """Report, as set by `check_mode`, if the loop `overflowed` its bound."""
+    if check_mode == "off":
+        return final_val
+
+    msg = "bounded_while_loop exceeded max_steps without cond_fn becoming False."
+    if check_mode == "functional":
+        # A functional error value, threaded out by `checkify.checkify`: no
+        # host callback, so it batches and nests without syncing.
+        checkify.check(jnp.logical_not(overflowed), msg)
+        return final_val
+    final_val = eqx.error_if(final_val, overflowed, msg)
+
+    return final_val  # noqa: RET504
+
+
+def _run_bounded_loop(
+    make_step: Callable[[jax.tree_util.PyTreeDef], _Step],
+    init_val: T,
+    *,
+    max_steps: int,
+    checkpoint: bool | Literal["nested"],
+    unroll: int | bool,
+    differentiable: bool,
+    check_mode: _CheckMode,
+    block_size: int,
+) -> T:
+    """Run a bounded loop for an already-validated `max_steps >= 1`.
+
+    `make_step` builds the loop step for the PyTree structure of `init_val`.
+    """
+    # The scan runs on the flat leaves of the carry: the PyTree structure is
+    # static, so flatten once here rather than at every iteration boundary.
+    init_leaves, treedef = jax.tree_util.tree_flatten(init_val)
+    step = make_step(treedef)
+
+    # Carry includes the termination flag. `still_running` starts True: we have
+    # not terminated.
+    init_carry: _LeavesCarry = (init_leaves, _RUNNING)
+
+    # Run for exactly max_steps steps.
+    final_leaves: list[Any]
+    final_flag: _Flag
+    remat_step = jax.checkpoint(step, prevent_cse=False) if checkpoint else step
+    if not differentiable:
+        # No reverse-mode AD needed: use a real while loop, which stops as soon
+        # as the user condition fails.
+        final_leaves, final_flag = _early_exit_while_loop(
+            step, init_carry, max_steps=max_steps
+        )
+    elif max_steps == 1:
+        # A single step needs no loop: inline it, so that XLA does not emit a
+        # `While` and can fuse the step into the surrounding program.
+        final_leaves, final_flag = remat_step(init_carry)
+    elif checkpoint == "nested":
+        # Blocks of ~sqrt(max_steps) rematerialized steps: O(sqrt) memory.
+        final_leaves, final_flag = _blocked_scan(
+            step,
+            init_carry,
+            max_steps,
+            block_size=math.isqrt(max_steps),
+            unroll=unroll,
+            remat=True,
+        )
+    elif block_size > 1:
+        # Fully unrolled inner blocks amortize the per-iteration `While`
+        # overhead over `block_size` steps.
+        final_leaves, final_flag = _blocked_scan(
+            remat_step,
+            init_carry,
+            max_steps,
+            block_size=block_size,
+            unroll=block_size,
+            outer_unroll=unroll,
+        )
+    else:
+        final_leaves, final_flag = _scan(
+            remat_step, init_carry, max_steps, unroll=unroll
+        )
+    final_val: T = jax.tree_util.tree_unflatten(treedef, final_leaves)
+
+    # If the final flag is still set, then the user condition never became
+    # False within max_steps, meaning the corresponding while-loop would still
+    # be continuing.
+    return _check_overflow(final_val, final_flag != 0, check_mode=check_mode)
+
+
+def _bounded_while_loop(
+    cond_fn: Callable[[T], Any],
+    body_fn: Callable[[T], T],
+    init_val: T,
+    *,
+    max_steps: int,
+    checkpoint: bool | Literal["nested"],
+    unroll: int | bool,
+    differentiable: bool,
+    check_mode: _CheckMode,
+    block_size: int,
+    vectorized: bool,
+) -> T:
+    """Run `bounded_while_loop` for an already-validated `max_steps >= 1`."""
+    # If the loop provably never runs, emit nothing.
+    if _is_static_false(cond_fn, init_val):
+        return init_val
+
+    if not differentiable:
+        # No reverse-mode AD needed: use a real while loop, which stops as soon
+        # as the user condition fails, and only runs `body_fn` on the steps
+        # actually taken.
+        final_val, overflowed = _while_loop(
+            cond_fn, body_fn, init_val, max_steps=max_steps
+        )
+        return _check_overflow(final_val, overflowed, check_mode=check_mode)
+
+    return _run_bounded_loop(
+        functools.partial(_make_step, cond_fn, body_fn, vectorized=vectorized),
+        init_val,
+        max_steps=max_steps,
+        checkpoint=checkpoint,
+        unroll=unroll,
+        differentiable=differentiable,
+        check_mode=check_mode,
+        block_size=block_size,
+    )
+
+
+def _fused_bounded_while_loop(
+    step_fn: Callable[[T], tuple[T, Any]],
+    init_val: T,
+    *,
+    max_steps: int,
+    checkpoint: bool | Literal["nested"],
+    unroll: int | bool,
+    differentiable: bool,
+    check_mode: _CheckMode,
+    block_size: int,
+) -> T:
+    """Run `fused_bounded_while_loop` for an already-validated `max_steps >= 1`."""
+    # If the loop provably never runs, emit nothing.
+    if _is_static_false(lambda val: step_fn(val)[1], init_val):
+        return init_val
+
+    return _run_bounded_loop(
+        functools.partial(_make_fused_step, step_fn),
+        init_val,
+        max_steps=max_steps,
+        checkpoint=checkpoint,
+        unroll=unroll,
+        differentiable=differentiable,
+        check_mode=check_mode,
+        block_size=block_size,
+    )
+
+
+# `typed=True`: `unroll=True` (full unrolling) and `unroll=1` (none) compare
+# and hash equal, but must not share a compiled loop.
+@functools.lru_cache(maxsize=128, typed=True)
+def _compiled_loop(
+    loop: Callable[..., T], fns: tuple[Callable[..., Any], ...], **options: object
+) -> Callable[[T], T]:
+    """Return a cached, jitted `loop(*fns, init_val, **options)` over `init_val`.
+
+    `jax.jit` itself caches compilations per PyTree structure and leaf
+    shapes/dtypes of `init_val`, so repeated calls with the same callables
+    and options skip both tracing and compilation.
+    """
+    return jax.jit(functools.partial(loop, *fns, **options))
+
+
+def _is_cacheable(fns: tuple[Callable[..., Any], ...], init_val: object) -> bool:
+    """Whether the jitted loop over `fns` may be cached and reused."""
+    # Inside an outer transformation, the outer trace compiles the loop anyway.
+    # Caching would gain nothing, and would keep the callables (and any tracers
+    # they close over) alive, leaking the outer trace.
+    if any(
+        isinstance(leaf, jax.core.Tracer)
+        for leaf in jax.tree_util.tree_leaves(init_val)
+    ):
+        return False
+    # Only plain functions without a closure: closures, `functools.partial`
+    # objects, bound methods and callable instances all carry state (possibly
+    # tracers) that can change between calls, which a cached trace would
+    # silently ignore, and that the cache would keep alive.
+    return all(type(fn) is types.FunctionType and fn.__closure__ is None for fn in fns)
+
+
+def _call_loop(
+    loop: Callable[..., T],
+    fns: tuple[Callable[..., Any], ...],
+    init_val: T,
+    *,
+    cache: bool,
+    **options: object,
+) -> T:
+    """Call `loop(*fns, init_val, **options)`, jitted and cached if requested."""
+    if not (cache and _is_cacheable(fns, init_val)):
+        return loop(*fns, init_val, **options)
+    compiled: Callable[[T], T] = _compiled_loop(loop, fns, **options)
+    return compiled(init_val)
+
+
+def _check_options(
+    *,
+    max_steps: int,
+    checkpoint: bool | Literal["nested"],
+    check_mode: _CheckMode,
+    block_size: int,
+) -> None:
+    """Validate the static loop options."""
+    # Exact type check: cheaper than `isinstance`, and rejects `bool` and NumPy
+    # integers, which are not valid static loop lengths.
+    if type(max_steps) is not int or max_steps < 0:
+        msg = "max_steps must be a non-negative Python int."
+        raise ValueError(msg)
+    if checkpoint not in (True, False, "nested"):
+        msg = "checkpoint must be a bool or 'nested'."
+        raise ValueError(msg)
+    if check_mode not in ("runtime", "functional", "off"):
+        msg = "check_mode must be 'runtime', 'functional' or 'off'."
+        raise ValueError(msg)
+    if type(block_size) is not int or block_size < 1:
+        msg = "block_size must be a positive Python int."
+        raise ValueError(msg)
+    if block_size > 1 and checkpoint == "nested":
+        msg = "block_size cannot be combined with checkpoint='nested'."
+        raise ValueError(msg)
 
 
 def bounded_while_loop(
@@ -21,6 +508,13 @@ def bounded_while_loop(
     init_val: T,
     *,
     max_steps: int,
+    checkpoint: bool | Literal["nested"] = False,
+    unroll: int | bool = 1,
+    differentiable: bool = True,
+    check_mode: _CheckMode = "runtime",
+    vectorized: bool = True,
+    block_size: int = 1,
+    cache: bool = False,
 ) -> T:
     r"""Reverse-mode-friendly, bounded `while_loop` implemented via `lax.scan`.
 
@@ -40,13 +534,15 @@ def bounded_while_loop(
     1. **A hard iteration bound**: the loop is unrolled as a fixed-length `scan`
        of length `max_steps`. This is often much friendlier to reverse-mode AD
        than an unbounded `lax.while_loop`.
-    2. **Early stop without wasted work**: once the user condition fails
-       (i.e. `cond_fn(val)` becomes `False`), we stop applying `body_fn` and
-       run only a no-op for the remaining scan steps. This preserves the fixed
-       length required by `scan` *without* performing unnecessary computation.
+    2. **Branchless early stop**: once the user condition fails (i.e.
+       `cond_fn(val)` becomes `False`), the result of `body_fn` is discarded
+       and the carry is passed through unchanged for the remaining scan
+       steps. This preserves the fixed length required by `scan` without any
+       `lax.cond` inside the loop.
 
     If the user condition is still `True` after `max_steps` iterations (i.e. the
-    loop would continue), an error is raised using `equinox.error_if`.
+    loop would continue), an error is raised using `equinox.error_if` (see
+    `check_mode`).
 
     Parameters
     ----------
@@ -59,14 +555,87 @@ def bounded_while_loop(
     init_val
         Initial loop carry (any PyTree of JAX arrays / scalars / nested containers).
     max_steps
-        Maximum number of iterations to attempt. Must be a non-negative Python int.
+        Maximum number of iterations to attempt. Must be a non-negative Python
+        `int`; `bool` and NumPy integers (e.g. `np.int64`) are rejected, convert
+        them with `int(max_steps)`.
+    checkpoint
+        Gradient checkpointing of the scan body, trading compute for memory in
+        reverse-mode AD. By default every intermediate carry is stored, so
+        memory grows linearly in `max_steps`.
+
+        - `False`: no checkpointing.
+        - `True`: wrap each step in `jax.checkpoint`. Only the carries are
+          stored; anything computed inside `body_fn` and `cond_fn` is
+          recomputed on the backward pass.
+        - `"nested"`: split the loop into two nested scans of length
+          ~`sqrt(max_steps)` and rematerialize the inner one, so that only
+          ~`sqrt(max_steps)` carries are stored, at the cost of roughly one
+          extra forward pass.
+          Cannot be combined with `block_size`.
+    unroll
+        Forwarded to `jax.lax.scan`: how many loop iterations to unroll within
+        a single iteration of the emitted XLA `While` loop. `True` (or
+        `unroll=max_steps`) unrolls the loop completely, removing the `While`
+        altogether; this is best for small `max_steps` with expensive bodies.
+        Unrolling gives XLA more room to fuse but increases compile time
+        roughly linearly in `unroll`, so avoid large values.
+    differentiable
+        Whether the loop must support reverse-mode AD. If `False`, the loop is
+        lowered to a `jax.lax.while_loop` bounded by `max_steps`, which
+        genuinely exits early at runtime as soon as `cond_fn` fails, instead
+        of running all `max_steps` (masked) steps, and only runs `body_fn` on
+        the iterations actually taken. Forward-mode AD and `jax.vmap` still
+        work, but reverse-mode AD does not. `checkpoint`, `unroll`,
+        `block_size` and `vectorized` are ignored.
+    check_mode
+        How to report that `cond_fn` is still `True` after `max_steps`
+        iterations.
+
+        - `"runtime"`: raise via `equinox.error_if`. This costs one host
+          callback per call.
+        - `"functional"`: emit a `jax.experimental.checkify.check`. The error
+          is a functional value with no host callback, so it batches and
+          nests (e.g. inside a hot `jax.vmap` or `jax.lax.scan`) without
+          syncing. The caller must wrap the computation in
+          `checkify.checkify` to receive it; calling the loop without
+          `checkify.checkify` raises an error at trace time.
+        - `"off"`: no check, for when `max_steps` is known to be a safe upper
+          bound. The final carry is returned silently even if the loop
+          overflowed.
+    vectorized
+        Whether each step is branchless. If `True` (default), `body_fn` is
+        evaluated on every step and its result is discarded with `lax.select`
+        once the loop has terminated. This is preferred when the loop will be
+        `jax.vmap`-ed (where a `lax.cond` becomes a select anyway) or when the
+        body is cheap. If `False`, the body is gated by a single `lax.cond` and
+        is not executed after termination, which can pay off for an expensive,
+        unbatched body, or one that is ill-defined past the termination point.
+    block_size
+        If greater than 1, run the loop as an outer scan of length
+        `max_steps // block_size` over inner, fully unrolled scans of
+        `block_size` steps (plus a trailing scan for any remainder). This
+        amortizes the per-iteration overhead of the XLA `While` loop and lets
+        XLA fuse across the steps of a block, at the cost of compile time
+        growing with `block_size`. `unroll` then applies to the outer scan.
+
+    cache
+        Whether to compile the loop with `jax.jit` and cache it on
+        `(cond_fn, body_fn)` and the keyword options, so that repeated calls
+        with the same callables and carry structure/shapes/dtypes dispatch
+        without retracing. As with any jitted function, a cached loop keeps
+        the trace of its first call: later changes to state read by
+        `cond_fn` or `body_fn` (e.g. reassigned globals) are not seen, and
+        Python side effects only happen once. Only plain functions without a
+        closure are cached; other callables (closures, `functools.partial`
+        objects, bound methods, callable instances), and calls inside another
+        JAX transformation, run uncached.
 
     Returns
     -------
     T
         Final carry value, either when `cond_fn` first returns `False`, or (if
         that never happens) after `max_steps` iterations (but in that case an
-        error is raised).
+        error is reported as set by `check_mode`).
 
     Examples
     --------
@@ -98,98 +667,163 @@ def bounded_while_loop(
     Semantics and implementation details:
 
     We convert the unbounded while loop into a bounded scan by augmenting the
-    carry with a boolean flag `done`:
+    carry with a boolean flag `still_running` (stored as an `int8`):
 
-    - `done == False` means we are still logically inside the while loop.
-    - `done == True` means the loop has logically terminated; remaining scan
-      steps must be no-ops.
+    - `still_running == True` means we are still logically inside the while
+      loop.
+    - `still_running == False` means the loop has logically terminated;
+      remaining scan steps must be no-ops. The flag is monotone: once `False`,
+      it stays `False`.
 
     At each scan step we do:
 
-    - If `done` is already `True`: do nothing (no-op).
-    - Else (not done):
-        - Evaluate `continue_ = cond_fn(val)`.
-        - If `continue_` is `True`: apply `body_fn`.
-        - If `continue_` is `False`: mark `done = True` and do *not* apply
-          `body_fn`.
+    - Update `still_running = still_running and cond_fn(val)`.
+    - Apply `body_fn` unconditionally and select, leaf by leaf, the new carry
+      where `still_running` is `True` and the old carry otherwise (with
+      `vectorized=False`, apply `body_fn` only where `still_running` is
+      `True`).
 
-    After the scan finishes, if `done` is still `False`, then `cond_fn` never
-    became false within the allowed steps, meaning the bounded loop
+    After the scan finishes, if `still_running` is still `True`, then `cond_fn`
+    never became false within the allowed steps, meaning the bounded loop
     "overflowed".
 
     Notes on efficiency:
 
-    - The remaining post-termination scan iterations are routed through a branch
-      that returns the carry unchanged. At runtime this avoids executing
-      `body_fn` after termination.
-    - `body_fn` and `cond_fn` are still traced/compiled as part of the JAX
-      program (that is unavoidable), but they are not *executed* once
-      `done=True`.
+    - `lax.cond` inside `lax.scan` is considerably slower than a select,
+      particularly on GPU, and prevents XLA from fusing the body with the
+      surrounding loop. The step is therefore branchless by default:
+      `body_fn` and `cond_fn` are *executed* on every scan step, including
+      those after termination, and their results are masked with
+      `lax.select`.
+    - This trades wasted work after termination for straight-line code. It is
+      the same tradeoff made by Diffrax's `bounded_while_loop`, and it is what
+      `jax.vmap` would turn a `lax.cond` into anyway. Pass `vectorized=False`
+      to gate the body with `lax.cond` instead.
+    - With `vectorized=True`, since `body_fn` is evaluated on the final carry,
+      it should not raise or produce non-finite values there if the result is
+      to be differentiated (the masked branch still contributes to the
+      cotangent).
+    - If `cond_fn(init_val)` is a constant `False` at trace time (e.g. a
+      Python `False`), no loop is emitted at all and `init_val` is returned
+      as is.
+    - Pass `cache=True` to skip retracing on repeated calls outside of
+      `jax.jit`. Alternatively, `jax.jit` the code calling
+      `bounded_while_loop`.
 
     """
-    if not isinstance(max_steps, int) or max_steps < 0:  # type: ignore[redundant-expr]
-        msg = "max_steps must be a non-negative Python int."
-        raise ValueError(msg)
+    _check_options(
+        max_steps=max_steps,
+        checkpoint=checkpoint,
+        check_mode=check_mode,
+        block_size=block_size,
+    )
 
     # Trivial bound: no iterations allowed.
     if max_steps == 0:
         return init_val
 
-    def scan_step(
-        carry: tuple[T, _BoolScalar],
-        _unused: object,
-    ) -> tuple[tuple[T, _BoolScalar], None]:
-        """One bounded step.
+    return _call_loop(
+        _bounded_while_loop,
+        (cond_fn, body_fn),
+        init_val,
+        max_steps=max_steps,
+        checkpoint=checkpoint,
+        unroll=unroll,
+        differentiable=differentiable,
+        check_mode=check_mode,
+        vectorized=vectorized,
+        block_size=block_size,
+        cache=cache,
+    )
 
-        carry
-            (val, done) where:
-            - val: the user loop carry
-            - done: whether the loop has already terminated
-        """
-        val, done = carry
 
-        def already_done(_: object, /) -> tuple[T, _BoolScalar]:
-            # No-op: preserve carry; remain done.
-            return carry
+def fused_bounded_while_loop(
+    step_fn: Callable[[T], tuple[T, Any]],
+    init_val: T,
+    *,
+    max_steps: int,
+    checkpoint: bool | Literal["nested"] = False,
+    unroll: int | bool = 1,
+    differentiable: bool = True,
+    check_mode: _CheckMode = "runtime",
+    block_size: int = 1,
+    cache: bool = False,
+) -> T:
+    r"""`bounded_while_loop` with a fused predicate-and-step function.
 
-        def do_body(_: object, /) -> tuple[T, _BoolScalar]:
-            # Continue: apply body; still not done.
-            return body_fn(val), jnp.asarray(False)  # noqa: FBT003
+    This function emulates:
 
-        def stop_now(_: object, /) -> tuple[T, _BoolScalar]:
-            # Stop: mark done, and do not run body.
-            return val, jnp.asarray(True)  # noqa: FBT003
+    ```python
+    val = init_val
+    i = 0
+    new_val, continue_ = step_fn(val)
+    while continue_ and i < max_steps:
+        val = new_val
+        new_val, continue_ = step_fn(val)
+        i += 1
+    return val
+    ```
 
-        def not_done(_: object, /) -> tuple[T, _BoolScalar]:
-            # We are still "in the loop": check whether to continue.
-            continue_ = jnp.asarray((cond_fn(val)), dtype=bool)
+    i.e. `step_fn(val)` returns `(body_fn(val), cond_fn(val))` in a single call.
+    Computing both together lets `step_fn` share work between the condition
+    and the body, and gives XLA a single subgraph per step to optimize (e.g.
+    with common subexpression elimination), rather than two subgraphs that
+    both consume the carry.
 
-            # If continue_ is True, run body. Otherwise terminate (done=True).
-            return lax.cond(continue_, do_body, stop_now, operand=None)  # type: ignore[no-any-return]
+    The step is always branchless: `step_fn` is evaluated on every scan step
+    and the new carry is discarded with `lax.select` once the loop has
+    terminated (see `bounded_while_loop` with `vectorized=True`).
 
-        # If we've already terminated, skip everything. Otherwise, proceed as
-        # above.
-        new_val, new_done = lax.cond(done, already_done, not_done, operand=None)
-        return (new_val, new_done), None
+    Parameters
+    ----------
+    step_fn
+        Fused loop step, mapping the loop carry `val` to a tuple
+        `(new_val, continue_)`. `new_val` is the carry after one iteration and
+        `continue_` is the boolean scalar loop condition evaluated on `val`
+        (not `new_val`), in the same sense as `cond_fn` in
+        `bounded_while_loop`.
+    init_val
+        Initial loop carry (any PyTree of JAX arrays / scalars / nested containers).
+    max_steps, checkpoint, unroll, differentiable, check_mode, block_size, cache
+        As in `bounded_while_loop`.
 
-    # Carry includes the termination flag. `done` starts False: we have not
-    # terminated.
-    init_carry: tuple[T, _BoolScalar] = (init_val, jnp.asarray(False))  # noqa: FBT003
+    Returns
+    -------
+    T
+        Final carry value, either when `continue_` is first `False`, or (if
+        that never happens) after `max_steps` iterations (but in that case an
+        error is reported as set by `check_mode`).
 
-    # Run for exactly max_steps steps. `_` is a dummy scan “sequence” input.
-    (final_val, final_done), _ = lax.scan(
-        scan_step,
-        init_carry,
-        xs=None,
-        length=max_steps,
-    )
+    Examples
+    --------
+    >>> import jax.numpy as jnp
+    >>> from jax_bounded_while import fused_bounded_while_loop
+    >>> def step_fn(x):
+    ...     return x + 1, x < 5
+    >>> fused_bounded_while_loop(step_fn, jnp.asarray(0), max_steps=10)
+    Array(5, dtype=int32, ...)
 
-    # If final_done is False, then cond_fn never became False within max_steps,
-    # meaning the corresponding while-loop would still be continuing.
-    final_val = eqx.error_if(
-        final_val,
-        jnp.logical_not(final_done),
-        "bounded_while_loop exceeded max_steps without cond_fn becoming False.",
+    """
+    _check_options(
+        max_steps=max_steps,
+        checkpoint=checkpoint,
+        check_mode=check_mode,
+        block_size=block_size,
     )
 
-    return final_val  # noqa: RET504
+    # Trivial bound: no iterations allowed.
+    if max_steps == 0:
+        return init_val
+
+    return _call_loop(
+        _fused_bounded_while_loop,
+        (step_fn,),
+        init_val,
+        max_steps=max_steps,
+        checkpoint=checkpoint,
+        unroll=unroll,
+        differentiable=differentiable,
+        check_mode=check_mode,
+        block_size=block_size,
+        cache=cache,
+    )
@@ -2,24 +2,42 @@
 
 from __future__ import annotations
 
+import functools
+import re
+
 import jax
 import jax.numpy as jnp
+import numpy as np
 import pytest
+from jax.experimental import checkify
 
-from jax_bounded_while import bounded_while_loop
+from jax_bounded_while import (
+    _compiled_loop,
+    bounded_while_loop,
+    fused_bounded_while_loop,
+)
 
 
-def test_scalar_loop_stops_on_condition() -> None:
-    """Stop when `cond_fn` first becomes False for a scalar carry."""
+def _cond_fn(x):
+    return x < 5
 
-    def cond_fn(x):
-        return x < 5
 
-    def body_fn(x):
-        return x + 1
+def _body_fn(x):
+    return x + 1
 
-    result = bounded_while_loop(cond_fn, body_fn, jnp.asarray(0), max_steps=10)
-    assert int(result) == 5
+
+@pytest.fixture(scope="module")
+def compiled_loop():
+    """Jitted loop counting up to 5, traced and compiled once per module."""
+    return jax.jit(
+        functools.partial(bounded_while_loop, _cond_fn, _body_fn, max_steps=10)
+    )
+
+
+@pytest.mark.parametrize(("init", "expected"), [(0, 5), (3, 5), (5, 5), (7, 7)])
+def test_scalar_loop_stops_on_condition(compiled_loop, init, expected) -> None:
+    """Stop when `cond_fn` first becomes False for a scalar carry."""
+    assert int(compiled_loop(jnp.asarray(init))) == expected
 
 
 def test_pytree_carry_tuple() -> None:
@@ -44,13 +62,15 @@ def test_pytree_carry_tuple() -> None:
 
 
 def test_early_stop_no_extra_body_calls() -> None:
-    """Avoid extra body calls after termination by keeping a counter."""
+    """Do not execute `body_fn` after termination when it is gated."""
+    calls = []
 
     def cond_fn(state):
         x, _ = state
         return x < 2
 
     def body_fn(state):
+        jax.debug.callback(lambda: calls.append(1))
         x, count = state
         return x + 1, count + 1
 
@@ -59,9 +79,12 @@ def test_early_stop_no_extra_body_calls() -> None:
         body_fn,
         (jnp.asarray(0), jnp.asarray(0)),
         max_steps=10,
+        vectorized=False,
     )
+    jax.effects_barrier()
     assert int(result[0]) == 2
     assert int(result[1]) == 2
+    assert len(calls) == 2
 
 
 def test_max_steps_zero_returns_init_without_calling_fns() -> None:
@@ -80,7 +103,7 @@ def test_max_steps_zero_returns_init_without_calling_fns() -> None:
     assert float(result["x"]) == 1.0
 
 
-@pytest.mark.parametrize("max_steps", [-1, 1.5, "3"])  # type: ignore[list-item]
+@pytest.mark.parametrize("max_steps", [-1, 1.5, "3", True, np.int64(3)])  # type: ignore[list-item]
 def test_invalid_max_steps_raises(max_steps) -> None:
     """Reject non-integer or negative values for `max_steps`."""
 
@@ -116,18 +139,538 @@ def test_raises_when_condition_never_false() -> None:
         bounded_while_loop(cond_fn, body_fn, jnp.asarray(0), max_steps=3)
 
 
-def test_jit_compilation() -> None:
-    """Work correctly under `jax.jit` compilation."""
+@pytest.mark.parametrize("init", [[0, 2, 4], [5, 9, -3]])
+def test_jit_compilation(compiled_loop, init) -> None:
+    """Work correctly under `jax.jit` and `jax.vmap`."""
+    x = jnp.asarray(init)
+    np.testing.assert_array_equal(jax.vmap(compiled_loop)(x), jnp.maximum(x, 5))
+
+
+def test_reverse_mode_gradient() -> None:
+    """Differentiate through the loop, ignoring post-termination steps."""
+
+    def cond_fn(state):
+        x, _ = state
+        return x < 3
+
+    def body_fn(state):
+        x, y = state
+        return x + 1, y * 2.0
+
+    def run(y0):
+        _, y = bounded_while_loop(cond_fn, body_fn, (jnp.asarray(0), y0), max_steps=10)
+        return y
+
+    assert float(jax.grad(run)(jnp.asarray(1.0))) == 8.0
+
+
+@pytest.mark.parametrize("checkpoint", [True, "nested"])
+@pytest.mark.parametrize("max_steps", [6, 7, 10])
+def test_checkpoint_matches_unchecked(checkpoint, max_steps) -> None:
+    """Give identical values and gradients with and without checkpointing."""
+
+    def cond_fn(state):
+        x, _ = state
+        return x < 5
+
+    def body_fn(state):
+        x, y = state
+        return x + 1, jnp.sin(y) * 2.0
+
+    def run(y0, *, checkpoint):
+        _, y = bounded_while_loop(
+            cond_fn,
+            body_fn,
+            (jnp.asarray(0), y0),
+            max_steps=max_steps,
+            checkpoint=checkpoint,
+        )
+        return y
+
+    y0 = jnp.asarray(0.5)
+    assert jnp.allclose(run(y0, checkpoint=checkpoint), run(y0, checkpoint=False))
+    assert jnp.allclose(
+        jax.grad(run)(y0, checkpoint=checkpoint),
+        jax.grad(run)(y0, checkpoint=False),
+    )
+
+
+def test_invalid_checkpoint_raises() -> None:
+    """Reject unknown `checkpoint` modes."""
+    with pytest.raises(Exception, match="checkpoint"):
+        bounded_while_loop(
+            lambda x: x < 1,
+            lambda x: x + 1,
+            jnp.asarray(0),
+            max_steps=3,
+            checkpoint="binomial",
+        )
+
+
+def test_max_steps_one_emits_no_loop() -> None:
+    """Inline the single step when `max_steps` is one."""
 
     def cond_fn(x):
-        return x < 4
+        return x < 1
 
     def body_fn(x):
-        return x + 2
+        return x + 1
+
+    def run(x):
+        return bounded_while_loop(cond_fn, body_fn, x, max_steps=1)
+
+    jaxpr = str(jax.make_jaxpr(run)(jnp.asarray(0)))
+    assert "scan[" not in jaxpr
+    assert "while[" not in jaxpr
+
+    with pytest.raises(RuntimeError, match="exceeded max_steps"):
+        run(jnp.asarray(0))
+    assert int(run(jnp.asarray(1))) == 1
+
+
+@pytest.mark.parametrize("unroll", [2, 3, True])
+def test_unroll(compiled_loop, unroll) -> None:
+    """Give the same result for any amount of scan unrolling."""
+    x = jnp.asarray(0)
+    result = bounded_while_loop(_cond_fn, _body_fn, x, max_steps=10, unroll=unroll)
+    assert int(result) == int(compiled_loop(x))
+
+
+def test_pytree_carry_mixed_shapes() -> None:
+    """Gate leaves of different shapes and dtypes with the same scalar flag."""
+
+    def cond_fn(state):
+        return state["i"] < 3
 
+    def body_fn(state):
+        return {"i": state["i"] + 1, "v": state["v"] * 2.0}
+
+    init = {"i": jnp.asarray(0), "v": jnp.ones((2, 3), dtype=jnp.float32)}
+    result = bounded_while_loop(cond_fn, body_fn, init, max_steps=6)
+    assert int(result["i"]) == 3
+    assert result["v"].dtype == jnp.float32
+    assert jnp.array_equal(result["v"], jnp.full((2, 3), 8.0))
+
+
+def test_not_differentiable_uses_while_loop() -> None:
+    """Lower to an early-exiting `lax.while_loop` when AD is not needed."""
+
+    def cond_fn(x):
+        return x < 5
+
+    def body_fn(x):
+        return x + 1
+
+    def run(x, max_steps):
+        return bounded_while_loop(
+            cond_fn, body_fn, x, max_steps=max_steps, differentiable=False
+        )
+
+    jaxpr = str(jax.make_jaxpr(lambda x: run(x, 10))(jnp.asarray(0)))
+    assert "while[" in jaxpr
+    assert "scan[" not in jaxpr
+    assert int(run(jnp.asarray(0), 10)) == 5
+    assert int(run(jnp.asarray(0), 6)) == 5
+    with pytest.raises(RuntimeError, match="exceeded max_steps"):
+        run(jnp.asarray(0), 5)
+
+
+def test_not_differentiable_runs_body_only_on_taken_steps() -> None:
+    """Run `body_fn` once per iteration taken, as a plain while loop would."""
+    calls = []
+
+    def body_fn(x):
+        jax.debug.callback(lambda: calls.append(1))
+        return x + 1
+
+    result = bounded_while_loop(
+        _cond_fn, body_fn, jnp.asarray(2), max_steps=10, differentiable=False
+    )
+    jax.effects_barrier()
+    assert int(result) == 5
+    assert len(calls) == 3
+
+
+_N_TRACES = [0]
+_LIMIT = 5
+
+
+def _counting_cond_fn(x):
+    _N_TRACES[0] += 1
+    return x < 5
+
+
+def _global_cond_fn(x):
+    return x < _LIMIT
+
+
+def _less_than(x, limit):
+    return x < limit
+
+
+class _Bound:
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+
+    def cond_fn(self, x):
+        return x < self.limit
+
+
+@pytest.fixture
+def cold_cache():
+    """Empty the jitted-loop cache, so that trace counts do not depend on order."""
+    _compiled_loop.cache_clear()
+
+
+@pytest.mark.usefixtures("cold_cache")
+def test_repeated_calls_reuse_compiled_loop() -> None:
+    """Do not retrace for repeated calls with the same callables and shapes."""
+    result = bounded_while_loop(
+        _counting_cond_fn, _body_fn, jnp.asarray(0), max_steps=9, cache=True
+    )
+    assert int(result) == 5
+    n_first = _N_TRACES[0]
+    result = bounded_while_loop(
+        _counting_cond_fn, _body_fn, jnp.asarray(2), max_steps=9, cache=True
+    )
+    assert int(result) == 5
+    assert _N_TRACES[0] == n_first
+
+    # Caching is opt-in.
+    bounded_while_loop(_counting_cond_fn, _body_fn, jnp.asarray(2), max_steps=9)
+    assert _N_TRACES[0] > n_first
+
+
+@pytest.mark.usefixtures("cold_cache")
+def test_cache_distinguishes_unroll_true_from_one() -> None:
+    """Do not share a compiled loop between `unroll=1` and `unroll=True`."""
+    x = jnp.asarray(0)
+    bounded_while_loop(
+        _counting_cond_fn, _body_fn, x, max_steps=8, unroll=1, cache=True
+    )
+    n_first = _N_TRACES[0]
+    bounded_while_loop(
+        _counting_cond_fn, _body_fn, x, max_steps=8, unroll=True, cache=True
+    )
+    assert _N_TRACES[0] > n_first
+
+
+def test_uncached_loop_sees_reassigned_global(monkeypatch) -> None:
+    """Read globals afresh on every call by default, as a plain loop would."""
+    x = jnp.asarray(0)
+    assert int(bounded_while_loop(_global_cond_fn, _body_fn, x, max_steps=20)) == 5
+    monkeypatch.setitem(globals(), "_LIMIT", 10)
+    assert int(bounded_while_loop(_global_cond_fn, _body_fn, x, max_steps=20)) == 10
+
+
+def test_stateful_callables_are_not_cached() -> None:
+    """Do not reuse stale traces of closures, partials or bound methods."""
+    limit = 5
+
+    def closure(x):
+        return x < limit
+
+    partial = functools.partial(_less_than, limit=5)
+    bound = _Bound(5)
+    for cond_fn in (closure, partial, bound.cond_fn):
+        result = bounded_while_loop(
+            cond_fn, _body_fn, jnp.asarray(0), max_steps=20, cache=True
+        )
+        assert int(result) == 5
+
+    limit = 10
+    partial.keywords["limit"] = 10
+    bound.limit = 10
+    for cond_fn in (closure, partial, bound.cond_fn):
+        result = bounded_while_loop(
+            cond_fn, _body_fn, jnp.asarray(0), max_steps=20, cache=True
+        )
+        assert int(result) == 10
+
+
+@pytest.mark.parametrize(
+    "make_cond_fn",
+    [
+        lambda t: lambda v: v < t,
+        lambda t: functools.partial(_less_than, limit=t),
+    ],
+    ids=["closure", "partial"],
+)
+def test_no_leaked_tracers_under_outer_jit(make_cond_fn) -> None:
+    """Do not keep callables over outer-transformation tracers alive."""
+
+    # `check_mode="off"`: the first use of `equinox.error_if` in a process trips
+    # `jax.checking_leaks` on its own.
     @jax.jit
+    def run(t):
+        return bounded_while_loop(
+            make_cond_fn(t),
+            _body_fn,
+            np.int32(0),
+            max_steps=11,
+            check_mode="off",
+            cache=True,
+        )
+
+    with jax.checking_leaks():
+        assert int(run(jnp.asarray(3))) == 3
+
+
+def test_check_mode_off_returns_overflowed_value() -> None:
+    """Return the carry after `max_steps` without raising if unchecked."""
+
+    def cond_fn(_: jax.Array):
+        return True
+
+    def body_fn(x):
+        return x + 1
+
+    result = bounded_while_loop(
+        cond_fn, body_fn, jnp.asarray(0), max_steps=3, check_mode="off"
+    )
+    assert int(result) == 3
+
+
+def test_functional_check_mode_reports_overflow_per_batch() -> None:
+    """Return a checkify error, batched under vmap, instead of raising."""
+
+    def cond_fn(x):
+        return x < 5
+
+    def body_fn(x):
+        return x + 1
+
+    def loop(x):
+        return bounded_while_loop(
+            cond_fn, body_fn, x, max_steps=3, check_mode="functional"
+        )
+
+    err, result = checkify.checkify(jax.vmap(loop))(jnp.asarray([4, 0]))
+    np.testing.assert_array_equal(result, [5, 3])
+    assert "exceeded max_steps" in (err.get() or "")
+
+    err, result = checkify.checkify(loop)(jnp.asarray(3))
+    assert int(result) == 5
+    assert err.get() is None
+
+
+def test_invalid_check_mode_raises() -> None:
+    """Reject unknown `check_mode` values."""
+    with pytest.raises(Exception, match="check_mode"):
+        bounded_while_loop(
+            lambda x: x < 1,
+            lambda x: x + 1,
+            jnp.asarray(0),
+            max_steps=3,
+            check_mode="raise",
+        )
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_vectorized_matches_under_vmap_and_grad(vectorized) -> None:
+    """Give the same values and gradients with and without branchless steps."""
+
+    def cond_fn(state):
+        x, _ = state
+        return x < 3
+
+    def body_fn(state):
+        x, y = state
+        return x + 1, y * 2.0
+
+    def run(x0, y0):
+        _, y = bounded_while_loop(
+            cond_fn, body_fn, (x0, y0), max_steps=5, vectorized=vectorized
+        )
+        return y
+
+    x0 = jnp.asarray([0, 1, 2])
+    y0 = jnp.asarray([1.0, 1.0, 1.0])
+    assert jnp.array_equal(jax.vmap(run)(x0, y0), jnp.asarray([8.0, 4.0, 2.0]))
+    assert float(jax.grad(run, argnums=1)(x0[0], y0[0])) == 8.0
+
+
+def test_static_false_condition_emits_no_loop() -> None:
+    """Return `init_val` without a loop if `cond_fn` is False at trace time."""
+
+    def cond_fn(_: jax.Array):
+        return False
+
+    def body_fn(_: jax.Array):  # pragma: no cover - should never run
+        msg = "body_fn should not be called when cond_fn is statically False"
+        raise AssertionError(msg)
+
     def run(x):
-        return bounded_while_loop(cond_fn, body_fn, x, max_steps=5)
+        return bounded_while_loop(cond_fn, body_fn, x, max_steps=10)
+
+    jaxpr = str(jax.make_jaxpr(run)(jnp.asarray(0)))
+    assert "scan[" not in jaxpr
+    assert "while[" not in jaxpr
+    assert int(run(jnp.asarray(3))) == 3
+
+
+@pytest.mark.parametrize("block_size", [2, 3, 4, 5, 10, 20])
+def test_block_size(block_size) -> None:
+    """Give the same values and gradients for any block decomposition."""
+
+    def cond_fn(state):
+        x, _ = state
+        return x < 7
 
-    result = run(jnp.asarray(0))
-    assert int(result) == 4
+    def body_fn(state):
+        x, y = state
+        return x + 1, y * 1.5
+
+    def run(y0, block_size):
+        _, y = bounded_while_loop(
+            cond_fn, body_fn, (jnp.asarray(0), y0), max_steps=10, block_size=block_size
+        )
+        return y
+
+    y0 = jnp.asarray(1.0)
+    assert jnp.allclose(run(y0, block_size), run(y0, 1))
+    assert jnp.allclose(jax.grad(run)(y0, block_size), jax.grad(run)(y0, 1))
+
+    # `max_steps // block_size` blocks: one outer scan over one inner scan, and
+    # no trailing remainder scan when `block_size` divides `max_steps`.
+    if 10 % block_size == 0:
+        jaxpr = str(jax.make_jaxpr(run, static_argnums=1)(y0, block_size))
+        assert jaxpr.count("scan[") == 2
+
+
+@pytest.mark.parametrize(
+    ("block_size", "checkpoint"), [(0, False), (1.5, False), (2, "nested")]
+)
+def test_invalid_block_size_raises(block_size, checkpoint) -> None:
+    """Reject non-positive block sizes and blocking combined with nesting."""
+    with pytest.raises(Exception, match="block_size"):
+        bounded_while_loop(
+            lambda x: x < 1,
+            lambda x: x + 1,
+            jnp.asarray(0),
+            max_steps=3,
+            block_size=block_size,
+            checkpoint=checkpoint,
+        )
+
+
+def test_body_changing_structure_raises() -> None:
+    """Reject a `body_fn` that changes the PyTree structure of the carry."""
+
+    def cond_fn(state):
+        x, _ = state
+        return x < 3
+
+    def body_fn(state):
+        x, y = state
+        return [x + 1, y]
+
+    with pytest.raises(TypeError, match="same PyTree structure"):
+        bounded_while_loop(
+            cond_fn, body_fn, (jnp.asarray(0), jnp.asarray(1)), max_steps=5
+        )
+
+
+@pytest.mark.parametrize("differentiable", [True, False])
+def test_fused_matches_two_callable_loop(differentiable) -> None:
+    """Give the same result from a fused `step_fn` as from `cond_fn`/`body_fn`."""
+
+    def cond_fn(state):
+        x, _ = state
+        return x < 3
+
+    def body_fn(state):
+        x, y = state
+        return x + 1, y * 2.0
+
+    def step_fn(state):
+        return body_fn(state), cond_fn(state)
+
+    init = (jnp.asarray(0), jnp.asarray(1.0))
+    result = fused_bounded_while_loop(
+        step_fn, init, max_steps=5, differentiable=differentiable
+    )
+    expected = bounded_while_loop(
+        cond_fn, body_fn, init, max_steps=5, differentiable=differentiable
+    )
+    assert int(result[0]) == int(expected[0]) == 3
+    assert float(result[1]) == float(expected[1]) == 8.0
+
+
+def test_fused_gradient_and_overflow() -> None:
+    """Differentiate through the fused loop, and raise on overflow."""
+
+    def step_fn(state):
+        x, y = state
+        return (x + 1, y * 2.0), x < 3
+
+    def run(y0, max_steps):
+        _, y = fused_bounded_while_loop(
+            step_fn, (jnp.asarray(0), y0), max_steps=max_steps
+        )
+        return y
+
+    assert float(jax.grad(run)(jnp.asarray(1.0), 4)) == 8.0
+    with pytest.raises(RuntimeError, match="exceeded max_steps"):
+        run(jnp.asarray(1.0), 3)
+
+
+def test_fused_step_fn_is_staged_once() -> None:
+    """Stage `step_fn` once per step, reusing it for the static check."""
+    calls = []
+
+    def step_fn(x):
+        jax.debug.callback(lambda: calls.append(1))
+        return x + 1, x < 5
+
+    def run(x):
+        return fused_bounded_while_loop(step_fn, x, max_steps=1, check_mode="off")
+
+    assert str(jax.make_jaxpr(run)(jnp.asarray(0))).count("debug_callback[") == 1
+    run(jnp.asarray(0))
+    run(jnp.asarray(0))
+    jax.effects_barrier()
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("block_size", [5, 10])
+def test_fused_static_check_keeps_block_decomposition(block_size) -> None:
+    """Stage `step_fn` once, in blocks that evenly divide `max_steps`."""
+
+    def step_fn(x):
+        jax.debug.callback(lambda: None)
+        return x + 1, x < 5
+
+    def run(x):
+        return fused_bounded_while_loop(
+            step_fn, x, max_steps=10, block_size=block_size, check_mode="off"
+        )
+
+    jaxpr = str(jax.make_jaxpr(run)(jnp.asarray(0)))
+    assert jaxpr.count("debug_callback[") == 1
+    # One outer scan over one inner block, and no remainder scan.
+    assert jaxpr.count("scan[") == 2
+    assert int(run(jnp.asarray(0))) == 5
+
+
+def test_gate_is_not_broadcast_per_leaf() -> None:
+    """Select on the scalar gate directly, without broadcasting it."""
+
+    def cond_fn(state):
+        return state["i"] < 3
+
+    def body_fn(state):
+        return {"i": state["i"] + 1, "v": state["v"] * 2.0, "w": state["w"] + 1.0}
+
+    init = {"i": jnp.asarray(0), "v": jnp.ones((2, 3)), "w": jnp.ones(4)}
+    hlo = (
+        jax.jit(
+            lambda s: bounded_while_loop(
+                cond_fn, body_fn, s, max_steps=4, check_mode="off"
+            )
+        )
+        .lower(init)
+        .as_text()
+    )
+    assert "select" in hlo
+    assert re.search(r"broadcast_in_dim .*\(tensor<i1>\) -> tensor<\d", hlo) is None